@@ -805,6 +805,47 @@ class DataProcessor:
         )
         return generated_keys
 
+    def _can_defer_keys(self):
+        """Check whether the ``keys`` can be generated for all the rows at once.
+
+        A ``RegexGenerator`` with a ``scrambled`` generation order shuffles the keys of every
+        call with ``numpy``, so its keys depend on how the rows are split across calls.
+
+        Returns:
+            bool:
+                ``False`` if any of the keys is generated with a ``scrambled`` order.
+        """
+        for key in self._keys:
+            transformer = self._hyper_transformer.field_transformers.get(key)
+            if getattr(transformer, 'generation_order', None) == 'scrambled':
+                return False
+
+        return True
+
+    def add_generated_keys(self, data, reset_keys=False):
+        """Generate the ``keys`` for all the rows of ``data`` at once.
+
+        This is meant for data that was reverse transformed with ``skip_keys=True``. If the
+        keys could not be skipped, the data already contains them and is returned as it is.
+
+        Args:
+            data (pandas.DataFrame):
+                Reverse transformed data without the keys.
+            reset_keys (bool):
+                Whether or not to reset the keys generators. Defaults to ``False``.
+
+        Returns:
+            pandas.DataFrame:
+                The data with the keys cast to their original dtypes.
+        """
+        if not self._keys or not len(data) or not self._can_defer_keys():
+            return data
+
+        generated_keys = self.generate_keys(len(data), reset_keys)
+        generated_keys.index = data.index
+        data[generated_keys.columns] = generated_keys[generated_keys.notna()]
+        return self._cast_and_format(data, list(generated_keys.columns))
+
     def transform(self, data, is_condition=False):
         """Transform the given data.
 
@@ -840,7 +881,67 @@ class DataProcessor:
 
         return transformed
 
-    def reverse_transform(self, data, reset_keys=False):
+    def _cast_and_format(self, reversed_data, columns):
+        """Cast the given columns back to their original dtypes and format them.
+
+        Args:
+            reversed_data (pandas.DataFrame):
+                Reverse transformed data.
+            columns (list):
+                Columns to cast and format.
+
+        Returns:
+            pandas.DataFrame:
+                The data with the columns cast and formatted.
+        """
+        for column_name in columns:
+            column_data = reversed_data[column_name]
+
+            dtype = self._dtypes[column_name]
+            if is_integer_dtype(dtype) and is_float_dtype(column_data.dtype):
+                column_data = column_data.round()
+
+            reversed_data[column_name] = column_data[column_data.notna()]
+            try:
+                reversed_data[column_name] = reversed_data[column_name].astype(dtype)
+            except (IntCastingNaNError, ValueError) as e:
+                message = (
+                    f"The real data in '{column_name}' was stored as '{dtype}' but the "
+                    'synthetic data could not be cast back to this type. If this is a '
+                    'problem, please check your input data and metadata settings.'
+                )
+                if isinstance(e, IntCastingNaNError):
+                    LOGGER.debug(message)
+                    continue
+
+                # Handle the ValueError case
+                column_metadata = self.metadata.columns.get(column_name)
+                sdtype = column_metadata.get('sdtype')
+                if sdtype not in self._DTYPE_TO_SDTYPE.values():
+                    LOGGER.info(message)
+                    if column_name in self.formatters:
+                        self.formatters.pop(column_name)
+                else:
+                    raise ValueError(e)
+            except OverflowError:
+                if not self._warned_overflow:
+                    warnings.warn(
+                        f"The real data in '{self.table_name}' and column '{column_name}' was "
+                        f"stored as '{dtype}' but the synthetic data overflowed when casting back "
+                        'to this type. If this is a problem, please check your input data '
+                        'and metadata settings.'
+                    )
+                self._warned_overflow = True
+
+        # reformat columns using the formatters
+        for column in columns:
+            if column in self.formatters:
+                data_to_format = reversed_data[column]
+                reversed_data[column] = self.formatters[column].format_data(data_to_format)
+
+        return reversed_data
+
+    def reverse_transform(self, data, reset_keys=False, skip_keys=False):
         """Reverse the transformed data to the original format.
 
         Args:
@@ -848,6 +949,11 @@ class DataProcessor:
                 Data to be reverse transformed.
             reset_keys (bool):
                 Whether or not to reset the keys generators. Defaults to ``False``.
+            skip_keys (bool):
+                Whether or not to skip generating the keys, so they can be generated
+                later for all the rows at once with ``add_generated_keys``. The keys are
+                still generated if they depend on how the rows are split across calls.
+                Defaults to ``False``.
 
         Returns:
             pandas.DataFrame
@@ -886,7 +992,7 @@ class DataProcessor:
             sampled_columns.extend(missing_columns)
             reversed_data[anonymized_data.columns] = anonymized_data[anonymized_data.notna()]
 
-        if self._keys and num_rows:
+        if self._keys and num_rows and not (skip_keys and self._can_defer_keys()):
             generated_keys = self.generate_keys(num_rows, reset_keys)
             sampled_columns.extend(self._keys)
             reversed_data[generated_keys.columns] = generated_keys[generated_keys.notna()]
@@ -906,51 +1012,7 @@ class DataProcessor:
         sampled_columns = [
             column for column in self.metadata.columns.keys() if column in sampled_columns
         ]
-        for column_name in sampled_columns:
-            column_data = reversed_data[column_name]
-
-            dtype = self._dtypes[column_name]
-            if is_integer_dtype(dtype) and is_float_dtype(column_data.dtype):
-                column_data = column_data.round()
-
-            reversed_data[column_name] = column_data[column_data.notna()]
-            try:
-                reversed_data[column_name] = reversed_data[column_name].astype(dtype)
-            except (IntCastingNaNError, ValueError) as e:
-                message = (
-                    f"The real data in '{column_name}' was stored as '{dtype}' but the "
-                    'synthetic data could not be cast back to this type. If this is a '
-                    'problem, please check your input data and metadata settings.'
-                )
-                if isinstance(e, IntCastingNaNError):
-                    LOGGER.debug(message)
-                    continue
-
-                # Handle the ValueError case
-                column_metadata = self.metadata.columns.get(column_name)
-                sdtype = column_metadata.get('sdtype')
-                if sdtype not in self._DTYPE_TO_SDTYPE.values():
-                    LOGGER.info(message)
-                    if column_name in self.formatters:
-                        self.formatters.pop(column_name)
-                else:
-                    raise ValueError(e)
-            except OverflowError:
-                if not self._warned_overflow:
-                    warnings.warn(
-                        f"The real data in '{self.table_name}' and column '{column_name}' was "
-                        f"stored as '{dtype}' but the synthetic data overflowed when casting back "
-                        'to this type. If this is a problem, please check your input data '
-                        'and metadata settings.'
-                    )
-                self._warned_overflow = True
-
-        # reformat columns using the formatters
-        for column in sampled_columns:
-            if column in self.formatters:
-                data_to_format = reversed_data[column]
-                reversed_data[column] = self.formatters[column].format_data(data_to_format)
-
+        reversed_data = self._cast_and_format(reversed_data, sampled_columns)
         return reversed_data[sampled_columns]
 
     def filter_valid(self, data):
@@ -7,9 +7,16 @@ from copy import deepcopy
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+from pandas.api.types import is_float_dtype, is_integer_dtype
 from rdt.transformers import FloatFormatter
 from tqdm import tqdm
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 from sdv._utils import _get_root_tables
 from sdv.errors import SynthesizerInputError
 from sdv.multi_table.base import BaseMultiTableSynthesizer
@@ -18,6 +25,122 @@ from sdv.sampling import BaseHierarchicalSampler
 LOGGER = logging.getLogger(__name__)
 MAX_NUMBER_OF_COLUMNS = 1000
 DEFAULT_EXTENDED_COLUMNS_DISTRIBUTION = 'truncnorm'
+# Batches of parent likelihoods hold two arrays of this many floats, about 64 MB at peak
+LIKELIHOODS_BATCH_ELEMENTS = 2**22
+MIN_GROUPS_TO_FIT_IN_PARALLEL = 100
+
+
+def _get_child_rows_parameters(
+    synthesizer_class, table_meta, synthesizer_kwargs, numerical_distributions, child_rows
+):
+    """Fit a synthesizer to the child rows of one foreign key value and get its parameters.
+
+    This is defined at module level so it can be sent to the ``joblib`` worker processes.
+
+    Args:
+        synthesizer_class (type):
+            Class of the single table synthesizer to fit.
+        table_meta (sdv.metadata.SingleTableMetadata):
+            Metadata of the child table.
+        synthesizer_kwargs (dict):
+            Keyword arguments used to instantiate the synthesizer.
+        numerical_distributions (dict):
+            Distributions to use for the extended columns of the child table.
+        child_rows (pandas.DataFrame):
+            The child rows that reference the same foreign key value.
+
+    Returns:
+        dict or None:
+            The flattened parameters of the fitted synthesizer, or ``None`` if it failed to fit.
+    """
+    try:
+        synthesizer = synthesizer_class(table_meta, **synthesizer_kwargs)
+        synthesizer._set_numerical_distributions(numerical_distributions)
+        synthesizer.fit_processed_data(child_rows)
+        return synthesizer._get_parameters()
+    except Exception:
+        return None
+
+
+def _choose_parent_positions(
+    values, weights, all_zero, fill_num_rows, remaining, column_positions, uniforms
+):
+    """Choose the parent of every row, decreasing the ``num_rows`` of every chosen parent.
+
+    Every row is sampled by inverting the cumulative distribution of its weights with the
+    given uniform value, which is what ``np.random.choice`` does with a ``p`` argument.
+    This function only uses ``numpy`` operations so it can be compiled with ``numba``.
+
+    Args:
+        values (numpy.ndarray):
+            The original likelihoods, with shape (num_rows, num_parents).
+        weights (numpy.ndarray):
+            The likelihoods with the invalid values filled with the mean of their row and
+            normalized to add up to 1 on every row.
+        all_zero (numpy.ndarray):
+            Whether every likelihood of a row is 0, so it has to fall back to ``num_rows``.
+        fill_num_rows (numpy.ndarray):
+            Whether the invalid likelihoods of a row have to be filled with ``num_rows``.
+        remaining (numpy.ndarray):
+            The remaining number of children of every ``num_rows`` value. Modified in place.
+        column_positions (numpy.ndarray):
+            The position in ``remaining`` of every likelihoods column.
+        uniforms (numpy.ndarray):
+            A uniform random value in [0, 1) for every row.
+
+    Returns:
+        numpy.ndarray:
+            The position of the chosen parent of every row. The position is relative to
+            ``remaining`` for the ``all_zero`` rows and to the likelihoods columns otherwise.
+    """
+    all_positions = np.arange(len(remaining))
+    chosen = np.empty(len(values), dtype=np.int64)
+    for row in range(len(values)):
+        if all_zero[row] or fill_num_rows[row]:
+            # The weights of these rows depend on the remaining ``num_rows``
+            if all_zero[row]:
+                positions = all_positions
+                row_likelihoods = remaining.copy()
+            else:
+                positions = column_positions
+                row_likelihoods = np.where(
+                    np.isnan(values[row]), remaining[column_positions], values[row]
+                )
+
+            total = row_likelihoods.sum()
+            if total == 0:
+                # Worse case scenario: we have no likelihoods
+                # and all num_rows are 0, so we fallback to uniform
+                row_weights = np.ones(len(row_likelihoods)) / len(row_likelihoods)
+            else:
+                row_weights = row_likelihoods / total
+
+            candidate_weights = np.where(remaining[positions] > 0, row_weights, 0.0)
+        else:
+            positions = column_positions
+            candidate_weights = np.where(remaining[positions] > 0, weights[row], 0.0)
+
+        # The parents without remaining children have a weight of 0, so they are never chosen
+        cdf = np.cumsum(candidate_weights)
+        if cdf[-1] == 0:
+            # All available candidates were assigned 0 likelihood of being the parent id
+            candidate_indices = np.nonzero(remaining[positions] > 0)[0]
+            if len(candidate_indices) == 0:
+                raise ValueError('There are no parent ids left to choose from.')
+
+            chosen[row] = candidate_indices[int(uniforms[row] * len(candidate_indices))]
+        else:
+            chosen[row] = np.searchsorted(cdf / cdf[-1], uniforms[row], side='right')
+
+        remaining[positions[chosen[row]]] -= 1
+
+    return chosen
+
+
+if njit is not None:
+    # The function is compiled the first time it is called. The compiled code is not cached
+    # to disk, since it would be written next to this module, which may be read only.
+    _choose_parent_positions = njit(_choose_parent_positions)
 
 
 class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
@@ -31,6 +154,11 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
             Defaults to ``['en_US']``.
         verbose (bool):
             Whether to print progress for fitting or not.
+        n_jobs (int):
+            Number of ``joblib`` jobs used to fit the synthesizers of the foreign key values of
+            a child table, where ``-1`` uses all the cores. Child tables with fewer than
+            ``MIN_GROUPS_TO_FIT_IN_PARALLEL`` foreign key values are always fitted sequentially.
+            Defaults to ``1``.
     """
 
     DEFAULT_SYNTHESIZER_KWARGS = {'default_distribution': 'beta'}
@@ -153,7 +281,7 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
 
         return columns_per_table
 
-    def __init__(self, metadata, locales=['en_US'], verbose=True):
+    def __init__(self, metadata, locales=['en_US'], verbose=True, n_jobs=1):
         BaseMultiTableSynthesizer.__init__(self, metadata, locales=locales)
         self._table_sizes = {}
         self._max_child_rows = {}
@@ -164,6 +292,7 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
         self._default_parameters = {}
         self._parent_extended_columns = defaultdict(list)
         self.verbose = verbose
+        self.n_jobs = n_jobs
         BaseHierarchicalSampler.__init__(
             self, self.metadata, self._table_synthesizers, self._table_sizes
         )
@@ -272,11 +401,18 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
 
         return processed_data
 
-    def _set_extended_columns_distributions(self, synthesizer, table_name, valid_columns):
+    def _get_extended_columns_distributions(self, table_name, valid_columns):
         numerical_distributions = {}
         for extended_column in self._parent_extended_columns[table_name]:
             if extended_column in valid_columns:
                 numerical_distributions[extended_column] = DEFAULT_EXTENDED_COLUMNS_DISTRIBUTION
+
+        return numerical_distributions
+
+    def _set_extended_columns_distributions(self, synthesizer, table_name, valid_columns):
+        numerical_distributions = self._get_extended_columns_distributions(
+            table_name, valid_columns
+        )
         synthesizer._set_numerical_distributions(numerical_distributions)
 
     def _get_extension(self, child_name, child_table, foreign_key, progress_bar_desc):
@@ -284,7 +420,8 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
 
         The resulting dataframe will have an index that contains all the foreign key values.
         The values for a given index are generated by flattening a synthesizer fitted with
-        the child rows with that foreign key value.
+        the child rows with that foreign key value. The synthesizers for the different
+        foreign key values are fitted in parallel.
 
         Args:
             child_name (str):
@@ -303,60 +440,99 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
 
         extension_rows = []
         foreign_key_columns = self.metadata._get_all_foreign_keys(child_name)
-        foreign_key_values = child_table[foreign_key].unique()
-        child_table = child_table.set_index(foreign_key)
 
-        index = []
-        scale_columns = None
-        pbar_args = self._get_pbar_args(desc=progress_bar_desc)
+        # A single groupby pass partitions the child rows by foreign key value, instead of
+        # looking up every value on the index. ``dropna=False`` keeps the null foreign key group.
+        # The foreign keys are not modeled, so they are left out before grouping and every
+        # group already contains only the columns to fit.
+        fit_columns = child_table.columns.difference(foreign_key_columns)
+        groups = child_table[fit_columns].groupby(
+            child_table[foreign_key], sort=False, dropna=False, observed=True
+        )
 
-        for foreign_key_value in tqdm(foreign_key_values, **pbar_args):
-            try:
-                child_rows = child_table.loc[[foreign_key_value]]
-            except KeyError:
-                # pre pandas 2.1 df.loc[[np.nan]] causes error
-                if pd.isna(foreign_key_value):
-                    child_rows = child_table[child_table.index.isna()]
-                else:
-                    raise
-            child_rows = child_rows[child_rows.columns.difference(foreign_key_columns)]
-            try:
-                if child_rows.empty and not pd.isna(foreign_key_value):
-                    row = pd.Series({'num_rows': len(child_rows)})
-                    row.index = f'__{child_name}__{foreign_key}__' + row.index
-                else:
+        index = []
+        single_rows = []
+        rows_to_fit = []
+        for foreign_key_value, child_rows in groups:
+            if pd.isna(foreign_key_value):
+                try:
                     synthesizer = self._synthesizer(
-                        table_meta,
-                        **self._table_parameters[child_name],
+                        table_meta, **self._table_parameters[child_name]
                     )
                     self._set_extended_columns_distributions(
                         synthesizer, child_name, child_rows.columns
                     )
-                    if not child_rows.empty:
-                        synthesizer.fit_processed_data(child_rows.reset_index(drop=True))
-                        row = synthesizer._get_parameters()
-                        row = pd.Series(row)
-                        row.index = f'__{child_name}__{foreign_key}__' + row.index
-
-                    if not pd.isna(foreign_key_value):
-                        if scale_columns is None:
-                            scale_columns = [
-                                column for column in row.index if column.endswith('scale')
-                            ]
-
-                        if len(child_rows) == 1:
-                            row.loc[scale_columns] = None
-
-                if pd.isna(foreign_key_value):
+                    if not fit_columns.empty:
+                        synthesizer.fit_processed_data(child_rows)
+
                     self._null_child_synthesizers[f'__{child_name}__{foreign_key}'] = synthesizer
-                else:
-                    extension_rows.append(row)
-                    index.append(foreign_key_value)
-            except Exception:
-                # Skip children rows subsets that fail
-                pass
+                except Exception:
+                    pass
 
-        return pd.DataFrame(extension_rows, index=index)
+            elif fit_columns.empty:
+                # The groups are never empty, but a child table with only foreign keys has no
+                # columns to fit, so only the number of child rows is learned
+                extension_rows.append({'num_rows': len(child_rows)})
+                index.append(foreign_key_value)
+                single_rows.append(False)
+
+            else:
+                rows_to_fit.append((foreign_key_value, child_rows))
+
+        pbar_args = self._get_pbar_args(desc=progress_bar_desc)
+        if rows_to_fit:
+            numerical_distributions = self._get_extended_columns_distributions(
+                child_name, rows_to_fit[0][1].columns
+            )
+            fit_args = (
+                self._synthesizer,
+                table_meta,
+                self._table_parameters[child_name],
+                numerical_distributions,
+            )
+            # Sending a few small groups to worker processes costs more than fitting them
+            n_jobs = getattr(self, 'n_jobs', 1)
+            if n_jobs == 1 or len(rows_to_fit) < MIN_GROUPS_TO_FIT_IN_PARALLEL:
+                parameters = (
+                    _get_child_rows_parameters(*fit_args, child_rows)
+                    for _, child_rows in rows_to_fit
+                )
+            else:
+                parameters = Parallel(n_jobs=n_jobs, return_as='generator')(
+                    delayed(_get_child_rows_parameters)(*fit_args, child_rows)
+                    for _, child_rows in rows_to_fit
+                )
+
+            for (foreign_key_value, child_rows), row in tqdm(
+                zip(rows_to_fit, parameters), total=len(rows_to_fit), **pbar_args
+            ):
+                if row is None:
+                    # Skip children rows subsets that fail
+                    continue
+
+                extension_rows.append(row)
+                index.append(foreign_key_value)
+                single_rows.append(len(child_rows) == 1)
+
+        # The parameters are kept as plain dictionaries and turned into a frame in one go,
+        # instead of building a ``pd.Series`` for every foreign key value. The parameters are
+        # then cast to their common dtype, as every ``pd.Series`` would have done.
+        extension = pd.DataFrame(extension_rows, index=index)
+        if len(extension.columns):
+            extension = extension.astype(np.result_type(*extension.dtypes))
+
+            # The scales fitted to a single child row are not meaningful, so they are nulled
+            # with one positional write over all the single row foreign key values
+            scale_positions = np.flatnonzero(extension.columns.str.endswith('scale'))
+            single_rows = np.flatnonzero(single_rows)
+            if len(scale_positions) and len(single_rows):
+                values = extension.to_numpy(dtype=float)
+                values[np.ix_(single_rows, scale_positions)] = np.nan
+                extension = pd.DataFrame(values, index=extension.index, columns=extension.columns)
+
+        extension.columns = f'__{child_name}__{foreign_key}__' + extension.columns
+
+        return extension
 
     @staticmethod
     def _clear_nans(table_data, ignore_cols=None):
@@ -365,8 +541,11 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
             columns = columns - set(ignore_cols)
         for column in columns:
             column_data = table_data[column]
-            if column_data.dtype in (int, float):
+            if is_integer_dtype(column_data) or is_float_dtype(column_data):
                 fill_value = 0 if column_data.isna().all() else column_data.mean()
+                if is_integer_dtype(column_data):
+                    # Nullable integer columns can only be filled with an integer value
+                    fill_value = round(fill_value)
             else:
                 fill_value = column_data.mode()[0]
 
@@ -394,6 +573,8 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
         self._table_sizes[table_name] = len(table)
         LOGGER.info('Computing extensions for table %s', table_name)
         children = self.metadata._get_child_map()[table_name]
+        extensions = []
+        extended_relationships = []
         for child_name in children:
             if child_name not in self._augmented_tables:
                 child_table = self._augment_table(tables[child_name], tables, child_name)
@@ -406,8 +587,9 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
                     f'({self._learned_relationships + 1}/{len(self.metadata.relationships)}) '
                     f"Tables '{table_name}' and '{child_name}' ('{foreign_key}')"
                 )
+                # ``_get_extension`` only reads from ``child_table``, so it does not need a copy
                 extension = self._get_extension(
-                    child_name, child_table.copy(), foreign_key, progress_bar_desc
+                    child_name, child_table, foreign_key, progress_bar_desc
                 )
                 for column in extension.columns:
                     extension[column] = extension[column].astype(float)
@@ -418,20 +600,38 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
                         enforce_min_max_values=True
                     )
                     self.extended_columns[child_name][column].fit(extension, column)
-                table = table.merge(extension, how='left', right_index=True, left_index=True)
-                num_rows_key = f'__{child_name}__{foreign_key}__num_rows'
-                table[num_rows_key] = table[num_rows_key].fillna(0)
-                self._max_child_rows[num_rows_key] = table[num_rows_key].max()
-                self._min_child_rows[num_rows_key] = table[num_rows_key].min()
-                self._null_foreign_key_percentages[f'__{child_name}__{foreign_key}'] = 1 - (
-                    table[num_rows_key].sum() / child_table.shape[0]
-                )
 
+                extensions.append(extension)
+                extended_relationships.append((child_name, foreign_key, len(child_table)))
                 if len(extension.columns) > 0:
                     self._parent_extended_columns[table_name].extend(list(extension.columns))
 
-                tables[table_name] = table
                 self._learned_relationships += 1
+
+        if extensions:
+            # Join all the extensions at once instead of reallocating the table for each of them
+            table = table.join(extensions, how='left')
+            num_rows_keys = [
+                f'__{child_name}__{foreign_key}__num_rows'
+                for child_name, foreign_key, _ in extended_relationships
+            ]
+            # Fill and reduce all the ``num_rows`` columns together as a single block
+            num_rows = table[num_rows_keys].fillna(0)
+            table[num_rows_keys] = num_rows
+            max_num_rows = num_rows.max()
+            min_num_rows = num_rows.min()
+            total_num_rows = num_rows.sum()
+            for num_rows_key, (child_name, foreign_key, num_child_rows) in zip(
+                num_rows_keys, extended_relationships
+            ):
+                self._max_child_rows[num_rows_key] = max_num_rows[num_rows_key]
+                self._min_child_rows[num_rows_key] = min_num_rows[num_rows_key]
+                self._null_foreign_key_percentages[f'__{child_name}__{foreign_key}'] = 1 - (
+                    total_num_rows[num_rows_key] / num_child_rows
+                )
+
+            tables[table_name] = table
+
         self._augmented_tables.append(table_name)
 
         foreign_keys = self.metadata._get_all_foreign_keys(table_name)
@@ -536,29 +736,42 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
             num_rows = flat_parameters[num_rows_key]
             flat_parameters[num_rows_key] = min(self._max_child_rows[num_rows_key], round(num_rows))
 
-        flat_parameters = flat_parameters.to_dict()
-        for parameter_name, parameter in flat_parameters.items():
-            float_formatter = self.extended_columns[table_name][parameter_name]
-            flat_parameters[parameter_name] = np.clip(  # this should be revisited in GH#1769
-                parameter, float_formatter._min_value, float_formatter._max_value
-            )
+        # All the parameters are clipped at once instead of calling ``np.clip`` for each one
+        float_formatters = [self.extended_columns[table_name][key] for key in keys]
+        flat_parameters = np.clip(  # this should be revisited in GH#1769
+            flat_parameters.to_numpy(),
+            [float_formatter._min_value for float_formatter in float_formatters],
+            [float_formatter._max_value for float_formatter in float_formatters],
+        )
 
-        return {new_keys[key]: value for key, value in flat_parameters.items()}
+        return {new_keys[key]: value for key, value in zip(keys, flat_parameters)}
 
     def _recreate_child_synthesizer(self, child_name, parent_name, parent_row):
         # A child table is created based on only one foreign key.
-        foreign_key = self.metadata._get_foreign_keys(parent_name, child_name)[0]
+        foreign_key = self._relationship_foreign_keys[parent_name, child_name][0]
 
         if parent_row is not None:
             parameters = self._extract_parameters(parent_row, child_name, foreign_key)
             default_parameters = getattr(self, '_default_parameters', {}).get(child_name, {})
-            table_meta = self.metadata.get_table_metadata(child_name)
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    'ignore', message=".*The 'SingleTableMetadata' is deprecated.*"
-                )
-                synthesizer = self._synthesizer(table_meta, **self._table_parameters[child_name])
+            # While sampling, a single synthesizer per child table is reused for all the parent
+            # rows, since its model is rebuilt from the parameters of every parent row.
+            child_synthesizers = getattr(self, '_child_synthesizers', {})
+            synthesizer = child_synthesizers.get(child_name)
+            if synthesizer is None:
+                table_meta = self.metadata.get_table_metadata(child_name)
+                with warnings.catch_warnings():
+                    warnings.filterwarnings(
+                        'ignore', message=".*The 'SingleTableMetadata' is deprecated.*"
+                    )
+                    synthesizer = self._synthesizer(
+                        table_meta, **self._table_parameters[child_name]
+                    )
 
+                child_synthesizers[child_name] = synthesizer
+
+            # Leave the synthesizer as if it was just created before setting the parameters
+            synthesizer._model = None
+            synthesizer._random_state_set = False
             synthesizer._set_parameters(parameters, default_parameters)
         else:
             synthesizer = self._null_child_synthesizers[f'__{child_name}__{foreign_key}']
@@ -568,63 +781,107 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
         return synthesizer
 
     @staticmethod
-    def _find_parent_id(likelihoods, num_rows):
-        """Find the parent id for one row based on the likelihoods of parent id values.
+    def _find_parent_id_values(likelihoods, num_rows):
+        """Find the parent id of every row based on the likelihoods of parent id values.
 
-        If likelihoods are invalid, fall back to the num_rows.
+        If the likelihoods of a row are invalid, fall back to the num_rows. The likelihoods
+        are validated and filled for all the rows at once, but the parent ids are chosen
+        row by row because every chosen parent has its ``num_rows`` decreased by one.
 
         Args:
-            likelihoods (pandas.Series):
-                The likelihood of parent id values.
+            likelihoods (pandas.DataFrame):
+                The likelihood of each parent id value (columns) for each row (index).
             num_rows (pandas.Series):
                 The number of times each parent id value appears in the data.
 
         Returns:
-            int:
-                The parent id for this row, chosen based on likelihoods.
+            pandas.Series:
+                The parent id for each row, chosen based on likelihoods.
         """
-        mean = likelihoods.mean()
-        if (likelihoods == 0).all():
-            # All rows got 0 likelihood, fallback to num_rows
-            likelihoods = num_rows
-        elif pd.isna(mean) or mean == 0:
-            # Some rows got singular matrix error and the rest were 0
-            # Fallback to num_rows on the singular matrix rows and
-            # keep 0s on the rest.
-            likelihoods = likelihoods.fillna(num_rows)
-        else:
-            # at least one row got a valid likelihood, so fill the
-            # rows that got a singular matrix error with the mean
-            likelihoods = likelihoods.fillna(mean)
-
-        total = likelihoods.sum()
-        if total == 0:
-            # Worse case scenario: we have no likelihoods
-            # and all num_rows are 0, so we fallback to uniform
-            length = len(likelihoods)
-            weights = np.ones(length) / length
-        else:
-            weights = likelihoods.to_numpy() / total
+        values = likelihoods.to_numpy(dtype=float)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            means = np.nanmean(values, axis=1)
+
+        # All rows got 0 likelihood, fallback to num_rows
+        all_zero = (values == 0).all(axis=1)
+        # Some rows got singular matrix error and the rest were 0. Fallback to num_rows
+        # on the singular matrix rows and keep 0s on the rest.
+        fill_num_rows = ~all_zero & (np.isnan(means) | (means == 0))
+        # At least one row got a valid likelihood, so fill the rows that got a singular
+        # matrix error with the mean
+        weights = np.where(np.isnan(values), means[:, None], values)
+        # Normalize all the rows at once, falling back to uniform weights when a row adds up to 0
+        totals = weights.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(weights, totals, out=weights)
+
+        weights[totals[:, 0] == 0] = 1 / max(weights.shape[1], 1)
+
+        remaining = num_rows.to_numpy(dtype=float)
+        column_positions = num_rows.index.get_indexer(likelihoods.columns)
+        # One uniform value is drawn per row from the global random state, so the results
+        # follow the numpy seed whether or not the sampling kernel is compiled with numba
+        uniforms = np.random.random_sample(len(values))
+        chosen = _choose_parent_positions(
+            values, weights, all_zero, fill_num_rows, remaining, column_positions, uniforms
+        )
 
-        candidates, candidate_weights = [], []
-        for parent, weight in zip(likelihoods.index.to_list(), weights):
-            if num_rows[parent] > 0:
-                candidates.append(parent)
-                candidate_weights.append(weight)
+        parent_ids = np.empty(len(chosen), dtype=object)
+        parent_ids[all_zero] = num_rows.index.to_numpy()[chosen[all_zero]]
+        parent_ids[~all_zero] = likelihoods.columns.to_numpy()[chosen[~all_zero]]
+        return pd.Series(parent_ids, index=likelihoods.index).infer_objects()
 
-        # cast candidates to series to ensure np.random.choice uses desired dtype
-        candidates = pd.Series(candidates, dtype=likelihoods.index.dtype)
+    @staticmethod
+    def _get_gaussian_densities(normal_scores, correlations):
+        """Compute the multivariate normal densities of a batch of parents at once.
 
-        # All available candidates were assigned 0 likelihood of being the parent id
-        if sum(candidate_weights) == 0:
-            chosen_parent = np.random.choice(candidates)
-        else:
-            candidate_weights = np.array(candidate_weights) / np.sum(candidate_weights)
-            chosen_parent = np.random.choice(candidates, p=candidate_weights)
+        This is equivalent to evaluating ``scipy.stats.multivariate_normal.pdf`` with
+        ``allow_singular=True`` for every parent, but all the correlation matrices are
+        decomposed together and the Mahalanobis distances are computed with a single
+        batched matrix product.
 
-        num_rows[chosen_parent] -= 1
+        Args:
+            normal_scores (numpy.ndarray):
+                Array of shape ``(num_parents, num_rows, num_columns)`` with the child rows
+                transformed to normal space using the marginals of each parent.
+            correlations (numpy.ndarray):
+                Array of shape ``(num_parents, num_columns, num_columns)`` with the correlation
+                matrix of each parent.
 
-        return chosen_parent
+        Returns:
+            numpy.ndarray:
+                Array of shape ``(num_parents, num_rows)`` with the density of each row for
+                each parent.
+        """
+        eigenvalues, eigenvectors = np.linalg.eigh(correlations)
+        max_eigenvalues = np.abs(eigenvalues).max(axis=1, keepdims=True)
+        eps = 1e6 * np.finfo(float).eps * max_eigenvalues
+        if np.any(eigenvalues.min(axis=1, keepdims=True) < -eps):
+            raise ValueError('The input matrix must be symmetric positive semidefinite.')
+
+        # Eigenvalues below the tolerance are treated as zero, as a pseudo-inverse would
+        nonzero = eigenvalues > eps
+        safe_eigenvalues = np.where(nonzero, eigenvalues, 1.0)
+        log_pdet = np.where(nonzero, np.log(safe_eigenvalues), 0.0).sum(axis=1)
+        rank = nonzero.sum(axis=1)
+
+        # The projection is the only array as large as ``normal_scores`` that is allocated, it
+        # is squared in place and reduced with matrix products instead of broadcast temporaries
+        projected = normal_scores @ eigenvectors
+        np.square(projected, out=projected)
+        inverse_eigenvalues = np.where(nonzero, 1 / safe_eigenvalues, 0.0)
+        maha = (projected @ inverse_eigenvalues[..., None])[..., 0]
+        densities = np.exp(-0.5 * (rank * np.log(2 * np.pi) + log_pdet)[:, None] - 0.5 * maha)
+
+        # Rows outside the support of a singular distribution have a density of 0. As in
+        # ``scipy``, rows that can't be compared to the tolerance, like the ones with NaN
+        # scores, are outside the support too, but only when the distribution is singular.
+        residual = np.sqrt((projected @ (~nonzero).astype(float)[..., None])[..., 0])
+        singular = (rank < correlations.shape[-1])[:, None]
+        densities[~(residual < 1e3 * eps) & singular] = 0.0
+
+        return densities
 
     def _get_likelihoods(self, table_rows, parent_rows, table_name, foreign_key):
         """Calculate the likelihood of each parent id value appearing in the data.
@@ -643,36 +900,92 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
             pandas.DataFrame:
                 A DataFrame of the likelihood of each parent id.
         """
-        likelihoods = {}
-        table_rows = table_rows.copy()
-
         data_processor = self._table_synthesizers[table_name]._data_processor
         transformed = data_processor.transform(table_rows)
-        if transformed.index.name:
-            table_rows = table_rows.set_index(transformed.index.name)
 
-        columns_to_drop = [column for column in transformed.columns if column in table_rows.columns]
-        table_rows = pd.concat([transformed, table_rows.drop(columns=columns_to_drop)], axis=1)
-        for parent_id, row in parent_rows.iterrows():
+        # Select only the columns that were not transformed, instead of copying all the rows,
+        # moving the primary key to the index and dropping the transformed columns afterwards
+        index_name = transformed.index.name
+        untransformed_columns = [
+            column
+            for column in table_rows.columns
+            if column not in transformed.columns and column != index_name
+        ]
+        untransformed = table_rows[untransformed_columns]
+        if index_name:
+            untransformed.index = pd.Index(table_rows[index_name], name=index_name)
+
+        table_rows = pd.concat([transformed, untransformed], axis=1)
+
+        # Only the parameter columns of this relationship are needed to rebuild the synthesizers,
+        # so build each parent row from those instead of boxing every value with ``iterrows``.
+        prefix = f'__{table_name}__{foreign_key}__'
+        parameter_columns = [column for column in parent_rows.columns if column.startswith(prefix)]
+        parameter_values = parent_rows[parameter_columns].astype(float).to_numpy()
+        # All the parents share the same parameter keys, so ``_set_parameters`` rebuilds the
+        # whole model every time and a single synthesizer can be reused for all of them.
+        table_meta = self._table_synthesizers[table_name].get_metadata()
+        synthesizer = self._synthesizer(table_meta, **self._table_parameters[table_name])
+        models = []
+        for parent_id, values in zip(parent_rows.index, parameter_values):
+            row = pd.Series(values, index=parameter_columns, name=parent_id)
             parameters = self._extract_parameters(row, table_name, foreign_key)
-            table_meta = self._table_synthesizers[table_name].get_metadata()
-            synthesizer = self._synthesizer(table_meta, **self._table_parameters[table_name])
             synthesizer._set_parameters(parameters)
-            try:
-                likelihoods[parent_id] = synthesizer._get_likelihood(table_rows)
-
-            except (AttributeError, np.linalg.LinAlgError):
-                likelihoods[parent_id] = None
+            models.append(synthesizer._model)
 
+        # The likelihoods are written by position into a preallocated array. The parents whose
+        # likelihood can't be computed are left as NaN.
         null_child_synths = getattr(self, '_null_child_synthesizers', {})
-        if f'__{table_name}__{foreign_key}' in null_child_synths:
+        has_null_parent = f'__{table_name}__{foreign_key}' in null_child_synths
+        columns = parent_rows.index.tolist() + ([np.nan] if has_null_parent else [])
+        likelihoods = np.full((len(table_rows), len(columns)), np.nan)
+
+        # Every parent has its own marginals, so the normal scores are computed per parent,
+        # but the densities of a chunk of parents are evaluated together in a single batch.
+        # The scores of each batch are written into the same buffer, which together with the
+        # projection in ``_get_gaussian_densities`` is the peak of memory used.
+        num_elements = max(1, len(table_rows) * len(table_rows.columns))
+        batch_size = max(1, min(len(models), LIKELIHOODS_BATCH_ELEMENTS // num_elements))
+        normal_scores = None
+        for start in range(0, len(models), batch_size):
+            positions, correlations = [], []
+            for position, model in enumerate(models[start : start + batch_size], start):
+                try:
+                    scores = model._transform_to_normal(table_rows)
+                    if normal_scores is None:
+                        normal_scores = np.empty((batch_size, *scores.shape))
+
+                    normal_scores[len(positions)] = scores
+                    correlations.append(np.asarray(model.correlation, dtype=float))
+                    positions.append(position)
+                except (AttributeError, np.linalg.LinAlgError):
+                    pass
+
+            if positions:
+                try:
+                    densities = self._get_gaussian_densities(
+                        normal_scores[: len(positions)], np.stack(correlations)
+                    )
+                    likelihoods[:, positions] = densities.T
+                except np.linalg.LinAlgError:
+                    # Evaluate the parents one at a time, so only the failing ones are left NaN
+                    for index, (position, correlation) in enumerate(zip(positions, correlations)):
+                        try:
+                            densities = self._get_gaussian_densities(
+                                normal_scores[index : index + 1], correlation[None]
+                            )
+                            likelihoods[:, position] = densities[0]
+                        except np.linalg.LinAlgError:
+                            pass
+
+        if has_null_parent:
             try:
-                likelihoods[np.nan] = synthesizer._get_likelihood(table_rows)
+                likelihoods[:, -1] = synthesizer._get_likelihood(table_rows)
 
             except (AttributeError, np.linalg.LinAlgError):
-                likelihoods[np.nan] = None
+                pass
 
-        return pd.DataFrame(likelihoods, index=table_rows.index)
+        return pd.DataFrame(likelihoods, index=table_rows.index, columns=pd.Index(columns))
 
     def _find_parent_ids(self, child_table, parent_table, child_name, parent_name, foreign_key):
         """Find parent ids for the given table and foreign key.
@@ -697,13 +1010,13 @@ class HMASynthesizer(BaseHierarchicalSampler, BaseMultiTableSynthesizer):
                 The parent ids for the given table data.
         """
         # Create a copy of the parent table with the primary key as index to calculate likelihoods
-        primary_key = self.metadata.tables[parent_name].primary_key
+        primary_key = self._primary_keys[parent_name]
         parent_table = parent_table.set_index(primary_key)
         num_rows = parent_table[f'__{child_name}__{foreign_key}__num_rows'].copy()
         num_rows.loc[np.nan] = child_table.shape[0] - num_rows.sum()
 
         likelihoods = self._get_likelihoods(child_table, parent_table, child_name, foreign_key)
-        return likelihoods.apply(self._find_parent_id, axis=1, num_rows=num_rows)
+        return self._find_parent_id_values(likelihoods, num_rows)
 
     def _add_foreign_key_columns(self, child_table, parent_table, child_name, parent_name):
         for foreign_key in self.metadata._get_foreign_keys(parent_name, child_name):
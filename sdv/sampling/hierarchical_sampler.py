@@ -28,6 +28,23 @@ class BaseHierarchicalSampler:
         self._null_foreign_key_percentages = {}
         self._table_synthesizers = table_synthesizers
         self._table_sizes = table_sizes
+        self._cache_metadata_lookups()
+
+    def _cache_metadata_lookups(self):
+        """Precompute the metadata lookups that are repeated for every sampled parent row.
+
+        The foreign keys of every relationship and the primary key of every table only depend
+        on the metadata, which can not change while sampling.
+        """
+        self._relationship_foreign_keys = {}
+        for relationship in self.metadata.relationships:
+            key = (relationship['parent_table_name'], relationship['child_table_name'])
+            foreign_keys = self._relationship_foreign_keys.setdefault(key, [])
+            foreign_keys.append(relationship['child_foreign_key'])
+
+        self._primary_keys = {
+            table_name: table.primary_key for table_name, table in self.metadata.tables.items()
+        }
 
     def _recreate_child_synthesizer(self, child_name, parent_name, parent_row):
         """Recreate a child table's synthesizer based on the parent's row.
@@ -57,7 +74,7 @@ class BaseHierarchicalSampler:
         """
         raise NotImplementedError()
 
-    def _sample_rows(self, synthesizer, num_rows=None):
+    def _sample_rows(self, synthesizer, num_rows=None, skip_keys=False):
         """Sample ``num_rows`` from ``synthesizer``.
 
         Args:
@@ -65,6 +82,8 @@ class BaseHierarchicalSampler:
                 The fitted synthesizer for the table.
             num_rows (int):
                 Number of rows to sample.
+            skip_keys (bool):
+                Whether to skip generating the keys of the sampled rows. Defaults to False.
 
         Returns:
             pandas.DataFrame:
@@ -73,7 +92,9 @@ class BaseHierarchicalSampler:
         if num_rows is None:
             num_rows = synthesizer._num_rows
 
-        return synthesizer._sample_batch(round(num_rows), keep_extra_columns=True)
+        return synthesizer._sample_batch(
+            round(num_rows), keep_extra_columns=True, skip_keys=skip_keys
+        )
 
     def _add_child_rows(self, child_name, parent_name, parent_row, sampled_data, num_rows=None):
         """Sample the child rows that reference the parent row.
@@ -86,21 +107,24 @@ class BaseHierarchicalSampler:
             parent_row (pd.Series):
                 The row from the parent table to sample for from the child table.
             sampled_data (dict):
-                A dictionary mapping table names to sampled data (pd.DataFrame).
+                A dictionary mapping table names to sampled data (pd.DataFrame). The sampled
+                child rows are appended to a list of chunks stored under ``child_name``.
             num_rows (int):
                 Number of rows to sample. If None, infers number of child rows to sample
                 from the parent row. Defaults to None.
         """
         # A child table is created based on only one foreign key.
-        foreign_key = self.metadata._get_foreign_keys(parent_name, child_name)[0]
+        foreign_key = self._relationship_foreign_keys[parent_name, child_name][0]
         if num_rows is None:
             num_rows = parent_row[f'__{child_name}__{foreign_key}__num_rows']
 
         child_synthesizer = self._recreate_child_synthesizer(child_name, parent_name, parent_row)
 
-        sampled_rows = self._sample_rows(child_synthesizer, num_rows)
+        # The keys are generated by ``_sample_children`` for all the child rows at once
+        # when the data processor allows it
+        sampled_rows = self._sample_rows(child_synthesizer, num_rows, skip_keys=True)
         if len(sampled_rows):
-            parent_key = self.metadata.tables[parent_name].primary_key
+            parent_key = self._primary_keys[parent_name]
             if foreign_key in sampled_rows:
                 # If foreign key is in sampeld rows raises `SettingWithCopyWarning`
                 row_indices = sampled_rows.index
@@ -110,13 +134,9 @@ class BaseHierarchicalSampler:
                     parent_row[parent_key] if parent_row is not None else np.nan
                 )
 
-            previous = sampled_data.get(child_name)
-            if previous is None:
-                sampled_data[child_name] = sampled_rows
-            else:
-                sampled_data[child_name] = pd.concat([previous, sampled_rows]).reset_index(
-                    drop=True
-                )
+            # The chunks are concatenated once by ``_sample_children`` after all the parent rows
+            # have been sampled, to avoid copying the growing table for every parent row.
+            sampled_data.setdefault(child_name, []).append(sampled_rows)
 
     def _enforce_table_size(self, child_name, table_name, scale, sampled_data):
         """Ensure the child table has the same size as in the real data times the scale factor.
@@ -245,6 +265,11 @@ class BaseHierarchicalSampler:
                         num_rows=num_null_rows,
                     )
 
+                child_table = pd.concat(sampled_data[child_name], ignore_index=True)
+                # The keys are generated once for all the child rows instead of per parent row,
+                # unless they depend on how the rows are split and were generated per parent row
+                data_processor = self._table_synthesizers[child_name]._data_processor
+                sampled_data[child_name] = data_processor.add_generated_keys(child_table)
                 self._sample_children(table_name=child_name, sampled_data=sampled_data, scale=scale)
 
     def _finalize(self, sampled_data):
@@ -265,13 +290,19 @@ class BaseHierarchicalSampler:
             synthesizer = self._table_synthesizers.get(table_name)
             dtypes = synthesizer._data_processor._dtypes
             for name, dtype in dtypes.items():
+                column = table_rows[name]
+                # Only columns with missing values need them dropped before casting, the
+                # assignment below aligns them back on the index
+                if column.isna().any():
+                    column = column.dropna()
+
                 try:
-                    table_rows[name] = table_rows[name].dropna().astype(dtype)
+                    table_rows[name] = column.astype(dtype)
                 except Exception:
                     LOGGER.info(
                         "Could not cast back to column's original dtype, keeping original typing."
                     )
-                    table_rows[name] = table_rows[name].dropna()
+                    table_rows[name] = column
 
             final_data[table_name] = table_rows[list(dtypes.keys())]
 
@@ -299,37 +330,47 @@ class BaseHierarchicalSampler:
                 sampled data tables as ``pandas.DataFrame``.
         """
         sampled_data = {}
-
-        # DFS to sample roots and then their children
-        non_root_parents = set(self.metadata._get_parent_map().keys())
-        root_parents = set(self.metadata.tables.keys()) - non_root_parents
-        send_min_sample_warning = False
-        for table in root_parents:
-            num_rows = round(self._table_sizes[table] * scale)
-            if num_rows <= 0:
-                send_min_sample_warning = True
-                num_rows = 1
-            synthesizer = self._table_synthesizers[table]
-            LOGGER.info(f'Sampling {num_rows} rows from table {table}')
-            sampled_data[table] = self._sample_rows(synthesizer, num_rows)
-            self._sample_children(table_name=table, sampled_data=sampled_data, scale=scale)
-
-        if send_min_sample_warning:
-            warn_msg = (
-                "The 'scale' parameter is too small. Some tables may have 1 row."
-                ' For better quality data, please choose a larger scale.'
-            )
-            warnings.warn(warn_msg)
-
-        added_relationships = set()
-        for relationship in self.metadata.relationships:
-            parent_name = relationship['parent_table_name']
-            child_name = relationship['child_table_name']
-            # When more than one relationship exists between two tables, only the first one
-            # is used to recreate the child tables, so the rest can be skipped.
-            if (parent_name, child_name) not in added_relationships:
-                self._add_foreign_key_columns(
-                    sampled_data[child_name], sampled_data[parent_name], child_name, parent_name
+        # Rebuild the lookups in case this instance was saved before they were cached
+        self._cache_metadata_lookups()
+        # Child synthesizers that ``_recreate_child_synthesizer`` can reuse during this run
+        self._child_synthesizers = {}
+
+        try:
+            # DFS to sample roots and then their children
+            non_root_parents = set(self.metadata._get_parent_map().keys())
+            root_parents = set(self.metadata.tables.keys()) - non_root_parents
+            send_min_sample_warning = False
+            for table in root_parents:
+                num_rows = round(self._table_sizes[table] * scale)
+                if num_rows <= 0:
+                    send_min_sample_warning = True
+                    num_rows = 1
+                synthesizer = self._table_synthesizers[table]
+                LOGGER.info(f'Sampling {num_rows} rows from table {table}')
+                sampled_data[table] = self._sample_rows(synthesizer, num_rows)
+                self._sample_children(table_name=table, sampled_data=sampled_data, scale=scale)
+
+            if send_min_sample_warning:
+                warn_msg = (
+                    "The 'scale' parameter is too small. Some tables may have 1 row."
+                    ' For better quality data, please choose a larger scale.'
                 )
-                added_relationships.add((parent_name, child_name))
+                warnings.warn(warn_msg)
+
+            added_relationships = set()
+            for relationship in self.metadata.relationships:
+                parent_name = relationship['parent_table_name']
+                child_name = relationship['child_table_name']
+                # When more than one relationship exists between two tables, only the first one
+                # is used to recreate the child tables, so the rest can be skipped.
+                if (parent_name, child_name) not in added_relationships:
+                    self._add_foreign_key_columns(
+                        sampled_data[child_name], sampled_data[parent_name], child_name, parent_name
+                    )
+                    added_relationships.add((parent_name, child_name))
+        finally:
+            # The cached child synthesizers are only valid during this run, so they are never
+            # kept on the instance, even when sampling fails
+            self._child_synthesizers = {}
+
         return self._finalize(sampled_data)
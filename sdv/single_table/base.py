@@ -656,6 +656,7 @@ class BaseSingleTableSynthesizer(BaseSynthesizer):
         float_rtol=0.1,
         previous_rows=None,
         keep_extra_columns=False,
+        skip_keys=False,
     ):
         """Sample rows with the given conditions.
 
@@ -686,6 +687,8 @@ class BaseSingleTableSynthesizer(BaseSynthesizer):
                 Valid rows sampled in the previous iterations.
             keep_extra_columns (bool):
                 Whether to keep extra columns from the sampled data. Defaults to False.
+            skip_keys (bool):
+                Whether to skip generating the keys of the sampled data. Defaults to False.
 
         Returns:
             tuple:
@@ -705,7 +708,7 @@ class BaseSingleTableSynthesizer(BaseSynthesizer):
                     raw_sampled = self._sample(num_rows, transformed_conditions)
                 except NotImplementedError:
                     raw_sampled = self._sample(num_rows)
-            sampled = self._data_processor.reverse_transform(raw_sampled)
+            sampled = self._data_processor.reverse_transform(raw_sampled, skip_keys=skip_keys)
             if keep_extra_columns:
                 input_columns = self._data_processor._hyper_transformer._input_columns
                 missing_cols = list(
@@ -726,7 +729,7 @@ class BaseSingleTableSynthesizer(BaseSynthesizer):
 
         else:
             sampled = pd.DataFrame(index=range(num_rows))
-            sampled = self._data_processor.reverse_transform(sampled)
+            sampled = self._data_processor.reverse_transform(sampled, skip_keys=skip_keys)
             return sampled, num_rows
 
     def _sample_batch(
@@ -739,6 +742,7 @@ class BaseSingleTableSynthesizer(BaseSynthesizer):
         progress_bar=None,
         output_file_path=None,
         keep_extra_columns=False,
+        skip_keys=False,
     ):
         """Sample a batch of rows with the given conditions.
 
@@ -780,6 +784,8 @@ class BaseSingleTableSynthesizer(BaseSynthesizer):
                 rows anywhere.
             keep_extra_columns (bool):
                 Whether to keep extra columns from the sampled data. Defaults to False.
+            skip_keys (bool):
+                Whether to skip generating the keys of the sampled data. Defaults to False.
 
         Returns:
             pandas.DataFrame:
@@ -802,6 +808,7 @@ class BaseSingleTableSynthesizer(BaseSynthesizer):
                 float_rtol,
                 sampled,
                 keep_extra_columns,
+                skip_keys=skip_keys,
             )
 
             num_new_valid_rows = num_valid - prev_num_valid
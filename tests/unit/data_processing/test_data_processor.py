@@ -1999,6 +1999,62 @@ class TestDataProcessor:
 
         assert result == instance._hyper_transformer.create_anonymized_columns.return_value
 
+    def test_add_generated_keys(self):
+        """Test that the keys are generated for all the rows and cast to their dtypes."""
+        # Setup
+        dp = DataProcessor(SingleTableMetadata())
+        dp._keys = ['key']
+        dp._dtypes = pd.Series([np.float64, np.int64], index=['a', 'key'])
+        dp._hyper_transformer = Mock()
+        dp._hyper_transformer.create_anonymized_columns.return_value = pd.DataFrame({
+            'key': [0.0, 1.0, 2.0]
+        })
+        data = pd.DataFrame({'a': [1.0, 2.0, 3.0]}, index=[3, 4, 5])
+
+        # Run
+        result = dp.add_generated_keys(data)
+
+        # Assert
+        dp._hyper_transformer.create_anonymized_columns.assert_called_once_with(
+            num_rows=3, column_names=['key']
+        )
+        expected = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'key': [0, 1, 2]}, index=[3, 4, 5])
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_add_generated_keys_scrambled_keys(self):
+        """Test that the data is returned as it is when a key has a ``scrambled`` order.
+
+        These keys were already generated by ``reverse_transform`` with every chunk of rows.
+        """
+        # Setup
+        dp = DataProcessor(SingleTableMetadata())
+        dp._keys = ['key']
+        dp._hyper_transformer = Mock()
+        dp._hyper_transformer.field_transformers = {'key': Mock(generation_order='scrambled')}
+        data = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'key': ['C1', 'C0', 'C2']})
+
+        # Run
+        result = dp.add_generated_keys(data)
+
+        # Assert
+        dp._hyper_transformer.create_anonymized_columns.assert_not_called()
+        assert result is data
+
+    def test_add_generated_keys_without_keys(self):
+        """Test that the data is returned as it is when there are no keys."""
+        # Setup
+        dp = DataProcessor(SingleTableMetadata())
+        dp._keys = []
+        dp._hyper_transformer = Mock()
+        data = pd.DataFrame({'a': [1.0, 2.0, 3.0]})
+
+        # Run
+        result = dp.add_generated_keys(data)
+
+        # Assert
+        dp._hyper_transformer.create_anonymized_columns.assert_not_called()
+        assert result is data
+
     @patch('sdv.data_processing.data_processor.LOGGER')
     def test_transform_primary_key(self, log_mock):
         """Test the ``transform`` method.
@@ -2357,6 +2413,62 @@ class TestDataProcessor:
         })
         pd.testing.assert_frame_equal(reverse_transformed, expected_output)
 
+    def test_reverse_transform_skip_keys(self):
+        """Test that the keys are not generated when ``skip_keys`` is ``True``."""
+        # Setup
+        dp = DataProcessor(SingleTableMetadata())
+        dp.fitted = True
+        dp.metadata = Mock()
+        dp.metadata.columns = {'a': None, 'key': None}
+        data = pd.DataFrame({'a': [1, 2, 3]})
+        dp._keys = ['key']
+        dp._hyper_transformer = Mock()
+        dp._constraints_to_reverse = []
+        dp._hyper_transformer.reverse_transform_subset.return_value = data.copy()
+        dp._hyper_transformer._output_columns = ['a']
+        dp._hyper_transformer.field_transformers = {}
+        dp._dtypes = pd.Series([np.float64, np.object_], index=['a', 'key'])
+
+        # Run
+        reverse_transformed = dp.reverse_transform(data, skip_keys=True)
+
+        # Assert
+        dp._hyper_transformer.create_anonymized_columns.assert_not_called()
+        pd.testing.assert_frame_equal(reverse_transformed, pd.DataFrame({'a': [1.0, 2.0, 3.0]}))
+
+    def test_reverse_transform_skip_keys_scrambled_keys(self):
+        """Test that keys with a ``scrambled`` order are generated even with ``skip_keys``.
+
+        Their values depend on how the rows are split across calls, so they can't be generated
+        later for all the rows at once.
+        """
+        # Setup
+        dp = DataProcessor(SingleTableMetadata())
+        dp.fitted = True
+        dp.metadata = Mock()
+        dp.metadata.columns = {'a': None, 'key': None}
+        data = pd.DataFrame({'a': [1, 2, 3]})
+        dp._keys = ['key']
+        dp._hyper_transformer = Mock()
+        dp._constraints_to_reverse = []
+        dp._hyper_transformer.reverse_transform_subset.return_value = data.copy()
+        dp._hyper_transformer._output_columns = ['a']
+        dp._hyper_transformer.field_transformers = {'key': Mock(generation_order='scrambled')}
+        dp._hyper_transformer.create_anonymized_columns.return_value = pd.DataFrame({
+            'key': ['C1', 'C0', 'C2']
+        })
+        dp._dtypes = pd.Series([np.float64, np.object_], index=['a', 'key'])
+
+        # Run
+        reverse_transformed = dp.reverse_transform(data, skip_keys=True)
+
+        # Assert
+        dp._hyper_transformer.create_anonymized_columns.assert_called_once_with(
+            num_rows=3, column_names=['key']
+        )
+        expected = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'key': ['C1', 'C0', 'C2']})
+        pd.testing.assert_frame_equal(reverse_transformed, expected)
+
     def test_reverse_transform_overflow(self):
         """Test it raises a warning when the reverse transform overflows."""
         # Setup
@@ -4,14 +4,134 @@ from unittest.mock import MagicMock, Mock, patch
 import numpy as np
 import pandas as pd
 import pytest
+from scipy import stats
 
 from sdv.errors import SynthesizerInputError
 from sdv.metadata.metadata import Metadata
-from sdv.multi_table.hma import HMASynthesizer
+from sdv.multi_table.hma import (
+    HMASynthesizer,
+    _choose_parent_positions,
+    _get_child_rows_parameters,
+)
 from sdv.single_table.copulas import GaussianCopulaSynthesizer
 from tests.utils import get_multi_table_data, get_multi_table_metadata
 
 
+def test__get_child_rows_parameters():
+    """Test that the parameters of a synthesizer fitted to the child rows are returned."""
+    # Setup
+    synthesizer_class = Mock()
+    synthesizer = synthesizer_class.return_value
+    synthesizer._get_parameters.return_value = {'num_rows': 2.0}
+    child_rows = pd.DataFrame({'value': [1.0, 2.0]})
+
+    # Run
+    result = _get_child_rows_parameters(
+        synthesizer_class,
+        'table_meta',
+        {'default_distribution': 'beta'},
+        {'value': 'truncnorm'},
+        child_rows,
+    )
+
+    # Assert
+    assert result == {'num_rows': 2.0}
+    synthesizer_class.assert_called_once_with('table_meta', default_distribution='beta')
+    synthesizer._set_numerical_distributions.assert_called_once_with({'value': 'truncnorm'})
+    synthesizer.fit_processed_data.assert_called_once_with(child_rows)
+
+
+def test__get_child_rows_parameters_fit_error():
+    """Test that ``None`` is returned when the synthesizer fails to fit."""
+    # Setup
+    synthesizer_class = Mock()
+    synthesizer_class.return_value.fit_processed_data.side_effect = ValueError()
+
+    # Run
+    result = _get_child_rows_parameters(
+        synthesizer_class, 'table_meta', {}, {}, pd.DataFrame({'value': [1.0]})
+    )
+
+    # Assert
+    assert result is None
+
+
+def test__choose_parent_positions():
+    """Test that the parents are chosen by inverting the cumulative weights of every row.
+
+    Parents without remaining children can't be chosen, and the rows where all the
+    likelihoods are 0 choose based on the remaining ``num_rows``.
+    """
+    # Setup
+    values = np.array([[0.2, 0.8], [0.2, 0.8], [0.0, 0.0]])
+    all_zero = np.array([False, False, True])
+    fill_num_rows = np.array([False, False, False])
+    remaining = np.array([1.0, 2.0, 1.0])
+    column_positions = np.array([0, 1])
+    uniforms = np.array([0.1, 0.1, 0.0])
+
+    # Run
+    result = _choose_parent_positions(
+        values, values, all_zero, fill_num_rows, remaining, column_positions, uniforms
+    )
+
+    # Assert
+    np.testing.assert_array_equal(result, [0, 1, 1])
+    np.testing.assert_array_equal(remaining, [0.0, 0.0, 1.0])
+
+
+def test__choose_parent_positions_no_candidates():
+    """Test that an error is raised when no parent has remaining children."""
+    # Setup
+    values = np.array([[0.2, 0.8]])
+    remaining = np.array([0.0, 0.0, 1.0])
+
+    # Run and Assert
+    with pytest.raises(ValueError, match='There are no parent ids left to choose from.'):
+        _choose_parent_positions(
+            values,
+            values,
+            np.array([False]),
+            np.array([False]),
+            remaining,
+            np.array([0, 1]),
+            np.array([0.5]),
+        )
+
+
+def test__choose_parent_positions_compiled():
+    """Test that the ``numba`` compiled function chooses the same parents as the Python one."""
+    # Setup
+    pytest.importorskip('numba')
+    rng = np.random.default_rng(0)
+    values = rng.random((200, 5))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:10] = 0.0
+    weights = np.where(np.isnan(values), np.nanmean(values, axis=1, keepdims=True), values)
+    totals = weights.sum(axis=1, keepdims=True)
+    weights = np.divide(weights, totals, out=np.full_like(weights, 0.2), where=totals != 0)
+    all_zero = np.zeros(200, dtype=bool)
+    all_zero[:10] = True
+    fill_num_rows = np.zeros(200, dtype=bool)
+    fill_num_rows[10:20] = True
+    remaining = np.full(6, 50.0)
+    column_positions = np.arange(5)
+    uniforms = rng.random(200)
+    python_remaining = remaining.copy()
+
+    # Run
+    result = _choose_parent_positions(
+        values, weights, all_zero, fill_num_rows, remaining, column_positions, uniforms
+    )
+    expected = _choose_parent_positions.py_func(
+        values, weights, all_zero, fill_num_rows, python_remaining, column_positions, uniforms
+    )
+
+    # Assert
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(remaining, python_remaining)
+
+
 class TestHMASynthesizer:
     def test___init__(self):
         """Test the default initialization of the ``HMASynthesizer``."""
@@ -78,6 +198,84 @@ class TestHMASynthesizer:
         })
 
         pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(
+            child_table,
+            pd.DataFrame({'id_nesreca': [0, 1, 2, 3], 'upravna_enota': [0, 1, 2, 3]}),
+        )
+
+    def test__get_extension_single_child_row(self):
+        """Test that only the scales of the foreign key values with a single child are nulled."""
+        # Setup
+        metadata = get_multi_table_metadata()
+        child_table = pd.DataFrame({'id_nesreca': [0, 1, 2], 'upravna_enota': [0, 0, 1]})
+        instance = HMASynthesizer(metadata)
+
+        # Run
+        result = instance._get_extension('nesreca', child_table, 'upravna_enota', '')
+
+        # Assert
+        scale = result['__nesreca__upravna_enota__univariates__id_nesreca__scale']
+        assert result.index.to_list() == [0, 1]
+        assert not pd.isna(scale[0])
+        assert pd.isna(scale[1])
+        assert result['__nesreca__upravna_enota__num_rows'].to_list() == [2.0, 1.0]
+
+    @patch('sdv.multi_table.hma.MIN_GROUPS_TO_FIT_IN_PARALLEL', 2)
+    @patch('sdv.multi_table.hma.Parallel')
+    def test__get_extension_n_jobs(self, mock_parallel):
+        """Test that the foreign key values are fitted in parallel with the given ``n_jobs``."""
+        # Setup
+        metadata = get_multi_table_metadata()
+        child_table = pd.DataFrame({'id_nesreca': [0, 1, 2, 3], 'upravna_enota': [0, 1, 2, 3]})
+        instance = HMASynthesizer(metadata, n_jobs=2)
+        mock_parallel.return_value.side_effect = lambda tasks: [
+            function(*args, **kwargs) for function, args, kwargs in tasks
+        ]
+
+        # Run
+        result = instance._get_extension('nesreca', child_table, 'upravna_enota', '')
+
+        # Assert
+        mock_parallel.assert_called_once_with(n_jobs=2, return_as='generator')
+        assert result.index.to_list() == [0, 1, 2, 3]
+
+    @patch('sdv.multi_table.hma.Parallel')
+    def test__get_extension_few_groups_sequential(self, mock_parallel):
+        """Test that child tables with few foreign key values are fitted sequentially."""
+        # Setup
+        metadata = get_multi_table_metadata()
+        child_table = pd.DataFrame({'id_nesreca': [0, 1, 2, 3], 'upravna_enota': [0, 1, 2, 3]})
+        instance = HMASynthesizer(metadata, n_jobs=-1)
+
+        # Run
+        result = instance._get_extension('nesreca', child_table, 'upravna_enota', '')
+
+        # Assert
+        mock_parallel.assert_not_called()
+        assert result.index.to_list() == [0, 1, 2, 3]
+
+    def test__get_extension_null_foreign_key(self):
+        """Test that rows with a null foreign key are fitted into a null child synthesizer.
+
+        The null foreign key group should not be part of the extension, but its synthesizer
+        should be stored in ``_null_child_synthesizers``.
+        """
+        # Setup
+        metadata = get_multi_table_metadata()
+        child_table = pd.DataFrame({
+            'id_nesreca': [0, 1, 2, 3],
+            'upravna_enota': [0.0, np.nan, 1.0, np.nan],
+        })
+        instance = HMASynthesizer(metadata)
+
+        # Run
+        result = instance._get_extension('nesreca', child_table, 'upravna_enota', '')
+
+        # Assert
+        assert result.index.to_list() == [0.0, 1.0]
+        assert result['__nesreca__upravna_enota__num_rows'].to_list() == [1.0, 1.0]
+        null_synthesizer = instance._null_child_synthesizers['__nesreca__upravna_enota']
+        assert null_synthesizer._num_rows == 2
 
     def test__get_distributions(self):
         """Test the ``_get_distributions`` method."""
@@ -238,6 +436,31 @@ class TestHMASynthesizer:
         })
         pd.testing.assert_frame_equal(expected_data, data)
 
+    def test__clear_nans_non_default_numerical_dtypes(self):
+        """Test that numerical columns with non 64-bit dtypes are filled with their mean.
+
+        The mean is rounded for the nullable integer columns.
+        """
+        # Setup
+        data = pd.DataFrame({
+            'float32': pd.Series([0, 1, 2, np.nan], dtype='float32'),
+            'nullable_int': pd.Series([0, 2, None, 4], dtype='Int64'),
+            'nullable_int_float_mean': pd.Series([0, 1, None, 1], dtype='Int64'),
+            'nullable_int_all_nan': pd.Series([None] * 4, dtype='Int64'),
+        })
+
+        # Run
+        HMASynthesizer._clear_nans(data)
+
+        # Assert
+        expected_data = pd.DataFrame({
+            'float32': pd.Series([0, 1, 2, 1], dtype='float32'),
+            'nullable_int': pd.Series([0, 2, 2, 4], dtype='Int64'),
+            'nullable_int_float_mean': pd.Series([0, 1, 1, 1], dtype='Int64'),
+            'nullable_int_all_nan': pd.Series([0] * 4, dtype='Int64'),
+        })
+        pd.testing.assert_frame_equal(expected_data, data)
+
     def test__model_tables(self):
         """Test that ``_model_tables`` performs the modeling.
 
@@ -461,10 +684,11 @@ class TestHMASynthesizer:
         table_meta = Mock()
         table_synthesizer = Mock()
         instance.metadata.tables = {'users': table_meta}
-        instance.metadata._get_foreign_keys.return_value = ['session_id']
+        instance._relationship_foreign_keys = {('sessions', 'users'): ['session_id']}
         instance._table_parameters = {'users': {'a': 1}}
         instance._table_synthesizers = {'users': table_synthesizer}
         instance._default_parameters = {'users': {'colA': 'default_param', 'colB': 'default_param'}}
+        instance._child_synthesizers = {}
 
         # Run
         synthesizer = HMASynthesizer._recreate_child_synthesizer(
@@ -477,6 +701,7 @@ class TestHMASynthesizer:
         # Assert
         assert synthesizer == instance._synthesizer.return_value
         assert synthesizer._data_processor == table_synthesizer._data_processor
+        assert instance._child_synthesizers == {'users': synthesizer}
         instance.metadata.get_table_metadata.assert_called_once_with('users')
         instance._synthesizer.assert_called_once_with(
             instance.metadata.get_table_metadata.return_value, a=1
@@ -487,6 +712,119 @@ class TestHMASynthesizer:
         )
         instance._extract_parameters.assert_called_once_with(parent_row, table_name, 'session_id')
 
+    def test__recreate_child_synthesizer_reuses_synthesizer(self):
+        """Test that the synthesizer of the child table is reused while sampling.
+
+        The reused synthesizer must have its model and random state reset before its
+        parameters are replaced, as if it was a new synthesizer.
+        """
+        # Setup
+        instance = Mock()
+        synthesizer = Mock()
+        synthesizer._random_state_set = True
+        table_synthesizer = Mock()
+        instance._relationship_foreign_keys = {('sessions', 'users'): ['session_id']}
+        instance._table_synthesizers = {'users': table_synthesizer}
+        instance._default_parameters = {}
+        instance._child_synthesizers = {'users': synthesizer}
+
+        # Run
+        result = HMASynthesizer._recreate_child_synthesizer(instance, 'users', 'sessions', 'row')
+
+        # Assert
+        assert result is synthesizer
+        assert result._model is None
+        assert result._random_state_set is False
+        assert result._data_processor == table_synthesizer._data_processor
+        instance._synthesizer.assert_not_called()
+        instance.metadata.get_table_metadata.assert_not_called()
+        synthesizer._set_parameters.assert_called_once_with(
+            instance._extract_parameters.return_value, {}
+        )
+
+    def test__find_parent_id_values(self):
+        """Test that the parent ids are chosen based on the likelihoods and ``num_rows``.
+
+        Once a parent has been chosen as many times as its ``num_rows``, it is no longer
+        a candidate for the remaining rows.
+        """
+        # Setup
+        likelihoods = pd.DataFrame(
+            {101: [1.0, 1.0, 0.5], 102: [0.0, 1.0, 0.5], 103: [0.0, 0.0, 0.0]},
+            index=[10, 11, 12],
+        )
+        num_rows = pd.Series([1, 1, 1, 0], index=[101, 102, 103, np.nan])
+
+        # Run
+        result = HMASynthesizer._find_parent_id_values(likelihoods, num_rows)
+
+        # Assert
+        expected = pd.Series([101, 102, 103], index=[10, 11, 12])
+        pd.testing.assert_series_equal(result, expected)
+
+    def test__find_parent_id_values_all_zero(self):
+        """Test that ``num_rows`` is used as the likelihoods when all of them are 0."""
+        # Setup
+        likelihoods = pd.DataFrame({101: [0.0, 0.0], 102: [0.0, 0.0]})
+        num_rows = pd.Series([0, 2, 0], index=[101, 102, np.nan])
+
+        # Run
+        result = HMASynthesizer._find_parent_id_values(likelihoods, num_rows)
+
+        # Assert
+        pd.testing.assert_series_equal(result, pd.Series([102.0, 102.0]))
+
+    def test__get_gaussian_densities(self):
+        """Test that the densities match the ``scipy`` multivariate normal densities."""
+        # Setup
+        normal_scores = np.array([
+            [[0.1, -0.5], [1.2, 0.3], [-0.7, -0.7]],
+            [[0.4, 0.4], [-1.0, 2.0], [0.0, 0.0]],
+        ])
+        correlations = np.array([
+            [[1.0, 0.3], [0.3, 1.0]],
+            [[1.0, 1.0], [1.0, 1.0]],
+        ])
+
+        # Run
+        result = HMASynthesizer._get_gaussian_densities(normal_scores, correlations)
+
+        # Assert
+        expected = np.array([
+            stats.multivariate_normal.pdf(scores, cov=correlation, allow_singular=True)
+            for scores, correlation in zip(normal_scores, correlations)
+        ])
+        np.testing.assert_allclose(result, expected)
+        assert result[1, 1] == 0.0
+
+    def test__get_gaussian_densities_nan_scores(self):
+        """Test that the rows with NaN scores match the ``scipy`` densities.
+
+        The rows with NaN scores are outside the support of a singular distribution, so they
+        have a density of 0, while a full rank distribution keeps them as NaN.
+        """
+        # Setup
+        normal_scores = np.array([
+            [[0.1, np.nan], [1.2, 0.3]],
+            [[np.nan, 0.4], [0.5, 0.5]],
+        ])
+        correlations = np.array([
+            [[1.0, 0.3], [0.3, 1.0]],
+            [[1.0, 1.0], [1.0, 1.0]],
+        ])
+
+        # Run
+        result = HMASynthesizer._get_gaussian_densities(normal_scores, correlations)
+
+        # Assert
+        expected = np.array([
+            stats.multivariate_normal.pdf(scores, cov=correlation, allow_singular=True)
+            for scores, correlation in zip(normal_scores, correlations)
+        ])
+        np.testing.assert_allclose(result, expected)
+        assert np.isnan(result[0, 0])
+        assert result[1, 0] == 0.0
+
     def test__get_likelihoods(self):
         """Test that ``_get_likelihoods`` computes the likelihoods.
 
@@ -508,12 +846,16 @@ class TestHMASynthesizer:
         foreign_key = 'parent_id'
 
         likelihoods = np.array([0.1, 0.2, 0.3, 0.4])
+        normal_scores = np.array([[0.1], [0.2], [0.3], [0.4]])
         child_synthesizer = Mock()
         child_synthesizer._data_processor.transform.return_value = table_rows
         instance._table_synthesizers = {'child_table': child_synthesizer}
         instance._table_parameters = {'child_table': {}}
         instance._extract_parameters = Mock()
-        instance._synthesizer.return_value._get_likelihood.return_value = likelihoods
+        model = instance._synthesizer.return_value._model
+        model._transform_to_normal.return_value = normal_scores
+        model.correlation = [[1.0]]
+        instance._get_gaussian_densities.return_value = np.array([likelihoods] * 3)
         instance._null_child_synthesizers = {}
 
         # Run
@@ -522,6 +864,11 @@ class TestHMASynthesizer:
         )
 
         # Assert
+        normal_scores_arg, correlations_arg = instance._get_gaussian_densities.call_args[0]
+        np.testing.assert_array_equal(normal_scores_arg, np.array([normal_scores] * 3))
+        np.testing.assert_array_equal(correlations_arg, np.ones((3, 1, 1)))
+        instance._synthesizer.assert_called_once_with(child_synthesizer.get_metadata.return_value)
+        assert instance._synthesizer.return_value._set_parameters.call_count == 3
         expected_result = pd.DataFrame({
             101: [0.1, 0.2, 0.3, 0.4],
             102: [0.1, 0.2, 0.3, 0.4],
@@ -529,11 +876,58 @@ class TestHMASynthesizer:
         })
         pd.testing.assert_frame_equal(result, expected_result)
 
+    def test__get_likelihoods_batch_linalg_error(self):
+        """Test that a ``LinAlgError`` in a batch only leaves the failing parents as ``NaN``.
+
+        When the densities of a batch raise a ``LinAlgError``, every parent of the batch is
+        evaluated on its own.
+        """
+        # Setup
+        instance = Mock(spec=HMASynthesizer)
+        table_rows = pd.DataFrame({'child_id': [1, 2, 3, 4], 'value': [10, 20, 30, 40]})
+        parent_rows = pd.DataFrame({
+            'parent_id': [101, 102, 103],
+            'param1': [0.1, 0.2, 0.3],
+            'param2': [5, 10, 15],
+        })
+        parent_rows = parent_rows.set_index('parent_id')
+
+        likelihoods = np.array([0.1, 0.2, 0.3, 0.4])
+        child_synthesizer = Mock()
+        child_synthesizer._data_processor.transform.return_value = table_rows
+        instance._table_synthesizers = {'child_table': child_synthesizer}
+        instance._table_parameters = {'child_table': {}}
+        instance._extract_parameters = Mock()
+        model = instance._synthesizer.return_value._model
+        model._transform_to_normal.return_value = np.array([[0.1], [0.2], [0.3], [0.4]])
+        model.correlation = [[1.0]]
+        instance._get_gaussian_densities.side_effect = [
+            np.linalg.LinAlgError(),
+            np.array([likelihoods]),
+            np.linalg.LinAlgError(),
+            np.array([likelihoods]),
+        ]
+        instance._null_child_synthesizers = {}
+
+        # Run
+        result = HMASynthesizer._get_likelihoods(
+            instance, table_rows, parent_rows, 'child_table', 'parent_id'
+        )
+
+        # Assert
+        assert instance._get_gaussian_densities.call_count == 4
+        expected_result = pd.DataFrame({
+            101: [0.1, 0.2, 0.3, 0.4],
+            102: [np.nan] * 4,
+            103: [0.1, 0.2, 0.3, 0.4],
+        })
+        pd.testing.assert_frame_equal(result, expected_result)
+
     def test__get_likelihoods_attribute_error(self):
         """Test when ``_get_likelihoods`` raises an ``AttributeError``.
 
         When an ``AttributeError`` is being raised, the likelihood for the given parent key should
-        be ``None``.
+        be ``NaN``.
         """
         # Setup
         instance = Mock(spec=HMASynthesizer)
@@ -555,11 +949,15 @@ class TestHMASynthesizer:
         instance._table_parameters = {'child_table': {}}
         instance._extract_parameters = Mock()
         instance._null_child_synthesizers = {}
-        instance._synthesizer.return_value._get_likelihood.side_effect = [
-            likelihoods,
+        normal_scores = np.array([[0.1], [0.2], [0.3], [0.4]])
+        model = instance._synthesizer.return_value._model
+        model._transform_to_normal.side_effect = [
+            normal_scores,
             AttributeError(),
-            likelihoods,
+            normal_scores,
         ]
+        model.correlation = [[1.0]]
+        instance._get_gaussian_densities.return_value = np.array([likelihoods] * 2)
 
         # Run
         result = HMASynthesizer._get_likelihoods(
@@ -569,7 +967,7 @@ class TestHMASynthesizer:
         # Assert
         expected_result = pd.DataFrame({
             101: [0.1, 0.2, 0.3, 0.4],
-            102: [None, None, None, None],
+            102: [np.nan, np.nan, np.nan, np.nan],
             103: [0.1, 0.2, 0.3, 0.4],
         })
         pd.testing.assert_frame_equal(result, expected_result)
@@ -578,7 +976,7 @@ class TestHMASynthesizer:
         """Test when ``_get_likelihoods`` raises a ``np.linalg.LinAlgError``.
 
         When an ``np.linalg.LinAlgError``` is being raised, the likelihood for the given parent
-        key should be ``None``.
+        key should be ``NaN``.
         """
         # Setup
         instance = Mock(spec=HMASynthesizer)
@@ -600,11 +998,15 @@ class TestHMASynthesizer:
         instance._table_parameters = {'child_table': {}}
         instance._extract_parameters = Mock()
         instance._null_child_synthesizers = {}
-        instance._synthesizer.return_value._get_likelihood.side_effect = [
-            likelihoods,
+        normal_scores = np.array([[0.1], [0.2], [0.3], [0.4]])
+        model = instance._synthesizer.return_value._model
+        model._transform_to_normal.side_effect = [
+            normal_scores,
             np.linalg.LinAlgError(),
-            likelihoods,
+            normal_scores,
         ]
+        model.correlation = [[1.0]]
+        instance._get_gaussian_densities.return_value = np.array([likelihoods] * 2)
 
         # Run
         result = HMASynthesizer._get_likelihoods(
@@ -614,7 +1016,7 @@ class TestHMASynthesizer:
         # Assert
         expected_result = pd.DataFrame({
             101: [0.1, 0.2, 0.3, 0.4],
-            102: [None, None, None, None],
+            102: [np.nan, np.nan, np.nan, np.nan],
             103: [0.1, 0.2, 0.3, 0.4],
         })
         pd.testing.assert_frame_equal(result, expected_result)
@@ -648,7 +1050,10 @@ class TestHMASynthesizer:
         instance._null_child_synthesizers = {}
 
         likelihoods = np.array([0.1, 0.2, 0.3, 0.4])
-        instance._synthesizer.return_value._get_likelihood.return_value = likelihoods
+        model = instance._synthesizer.return_value._model
+        model._transform_to_normal.return_value = np.array([[0.1], [0.2], [0.3], [0.4]])
+        model.correlation = [[1.0]]
+        instance._get_gaussian_densities.return_value = np.array([likelihoods] * 3)
         mock_concat.return_value = pd.DataFrame({
             'child_id': [1, 2, 3, 4],
             'value': [10, 20, 30, 40],
@@ -673,6 +1078,51 @@ class TestHMASynthesizer:
         )
         pd.testing.assert_frame_equal(df_two, pd.DataFrame({'child_id': [1, 2, 3, 4]}))
 
+    @patch('sdv.multi_table.hma.pd.concat')
+    def test_get_likelihoods_primary_key_index(self, mock_concat):
+        """Test that the untransformed columns are indexed by the primary key of the child."""
+        # Setup
+        instance = Mock(spec=HMASynthesizer)
+        table_rows = pd.DataFrame({
+            'child_id': [1, 2, 3, 4],
+            'parent_id': [101, 101, 102, 103],
+            'value': [10, 20, 30, 40],
+        })
+        transformed_table_rows = pd.DataFrame(
+            {'value': [0.1, 0.2, 0.3, 0.4]}, index=pd.Index([1, 2, 3, 4], name='child_id')
+        )
+        parent_rows = pd.DataFrame({'parent_id': [101, 102, 103], 'param1': [0.1, 0.2, 0.3]})
+        parent_rows = parent_rows.set_index('parent_id')
+
+        child_synthesizer = Mock()
+        child_synthesizer._data_processor.transform.return_value = transformed_table_rows
+        instance._table_synthesizers = {'child_table': child_synthesizer}
+        instance._table_parameters = {'child_table': {}}
+        instance._extract_parameters = Mock()
+        instance._null_child_synthesizers = {}
+        model = instance._synthesizer.return_value._model
+        model._transform_to_normal.return_value = np.array([[0.1], [0.2], [0.3], [0.4]])
+        model.correlation = [[1.0]]
+        instance._get_gaussian_densities.return_value = np.ones((3, 4))
+        mock_concat.return_value = transformed_table_rows
+
+        # Run
+        HMASynthesizer._get_likelihoods(
+            instance, table_rows, parent_rows, 'child_table', 'parent_id'
+        )
+
+        # Assert
+        df_one, df_two = mock_concat.call_args_list[0][0][0]
+        pd.testing.assert_frame_equal(df_one, transformed_table_rows)
+        pd.testing.assert_frame_equal(
+            df_two,
+            pd.DataFrame(
+                {'parent_id': [101, 101, 102, 103]},
+                index=pd.Index([1, 2, 3, 4], name='child_id'),
+            ),
+        )
+        assert list(table_rows.columns) == ['child_id', 'parent_id', 'value']
+
     def test_get_learned_distributions(self):
         """Test that ``get_learned_distributions`` returns a dict.
 
@@ -737,7 +1187,7 @@ class TestHMASynthesizer:
         result = instance.get_parameters()
 
         # Assert
-        assert result == {'locales': 'en_CA', 'verbose': True}
+        assert result == {'locales': 'en_CA', 'verbose': True, 'n_jobs': 1}
 
     def test__add_foreign_key_columns(self):
         """Test that the ``_add_foreign_key_columns`` method adds foreign keys."""
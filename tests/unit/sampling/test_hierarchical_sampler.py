@@ -21,6 +21,27 @@ class TestBaseHierarchicalSampler:
         assert instance._table_synthesizers == {}
         assert instance._table_sizes == {}
 
+    def test__cache_metadata_lookups(self):
+        """Test that the foreign keys and primary keys are cached from the metadata."""
+        # Setup
+        metadata = get_multi_table_metadata()
+        instance = BaseHierarchicalSampler(metadata, table_synthesizers={}, table_sizes={})
+
+        # Run
+        instance._cache_metadata_lookups()
+
+        # Assert
+        assert instance._relationship_foreign_keys == {
+            ('upravna_enota', 'nesreca'): ['upravna_enota'],
+            ('nesreca', 'oseba'): ['id_nesreca'],
+            ('upravna_enota', 'oseba'): ['upravna_enota'],
+        }
+        assert instance._primary_keys == {
+            'nesreca': 'id_nesreca',
+            'oseba': None,
+            'upravna_enota': 'id_upravna_enota',
+        }
+
     def test__recreate_child_synthesizer(self):
         """Test that ``_recreate_child_synthesizer`` raises a ``NotImplementedError``."""
         # Setup
@@ -56,7 +77,9 @@ class TestBaseHierarchicalSampler:
 
         # Assert
         assert result == synthesizer._sample_batch.return_value
-        synthesizer._sample_batch.assert_called_once_with(10, keep_extra_columns=True)
+        synthesizer._sample_batch.assert_called_once_with(
+            10, keep_extra_columns=True, skip_keys=False
+        )
 
     def test__sample_rows_missing_num_rows(self):
         """Test that ``_sample_rows`` falls back to ``synthesizer._num_rows``."""
@@ -69,7 +92,9 @@ class TestBaseHierarchicalSampler:
 
         # Assert
         assert result == synthesizer._sample_batch.return_value
-        synthesizer._sample_batch.assert_called_once_with(10, keep_extra_columns=True)
+        synthesizer._sample_batch.assert_called_once_with(
+            10, keep_extra_columns=True, skip_keys=False
+        )
 
     def test__add_child_rows(self):
         """Test adding child rows when sampled data is empty."""
@@ -83,8 +108,9 @@ class TestBaseHierarchicalSampler:
         users_meta = Mock()
         users_meta.primary_key = 'user_id'
         metadata.tables = {'users': users_meta, 'sessions': sessions_meta}
-        metadata._get_foreign_keys.return_value = ['user_id']
         instance.metadata = metadata
+        instance._relationship_foreign_keys = {('users', 'sessions'): ['user_id']}
+        instance._primary_keys = {'users': 'user_id', 'sessions': None}
 
         instance._sample_rows.return_value = pd.DataFrame({
             'session_id': ['a', 'b', 'c'],
@@ -110,12 +136,16 @@ class TestBaseHierarchicalSampler:
             'country': ['us', 'us', 'es'],
             'user_id': [1, 2, 3],
         })
-        pd.testing.assert_frame_equal(sampled_data['sessions'], expected_result)
+        assert len(sampled_data['sessions']) == 1
+        pd.testing.assert_frame_equal(sampled_data['sessions'][0], expected_result)
+        instance._sample_rows.assert_called_once_with(
+            child_synthesizer_mock, parent_row['__sessions__user_id__num_rows'], skip_keys=True
+        )
 
     def test__add_child_rows_with_sampled_data(self):
         """Test adding child rows when sampled data contains values.
 
-        The new sampled data has to be concatenated to the current sampled data.
+        The new sampled data has to be appended to the chunks of the current sampled data.
         """
         # Setup
         instance = Mock()
@@ -127,8 +157,9 @@ class TestBaseHierarchicalSampler:
         users_meta = Mock()
         users_meta.primary_key.return_value = 'user_id'
         metadata.tables = {'users': users_meta, 'sessions': sessions_meta}
-        metadata._get_foreign_keys.return_value = ['user_id']
         instance.metadata = metadata
+        instance._relationship_foreign_keys = {('users', 'sessions'): ['user_id']}
+        instance._primary_keys = {'users': users_meta.primary_key, 'sessions': None}
         instance._synthesizer_kwargs = {'a': 0.1, 'b': 0.5, 'loc': 0.25}
 
         instance._sample_rows.return_value = pd.DataFrame({
@@ -142,12 +173,14 @@ class TestBaseHierarchicalSampler:
             '__sessions__user_id__num_rows': [10, 10, 10],
         })
         sampled_data = {
-            'sessions': pd.DataFrame({
-                'user_id': [0, 1, 0],
-                'session_id': ['d', 'e', 'f'],
-                'os': ['linux', 'mac', 'win'],
-                'country': ['us', 'us', 'es'],
-            })
+            'sessions': [
+                pd.DataFrame({
+                    'user_id': [0, 1, 0],
+                    'session_id': ['d', 'e', 'f'],
+                    'os': ['linux', 'mac', 'win'],
+                    'country': ['us', 'us', 'es'],
+                })
+            ]
         }
 
         # Run
@@ -162,7 +195,9 @@ class TestBaseHierarchicalSampler:
             'os': ['linux', 'mac', 'win', 'linux', 'mac', 'win'],
             'country': ['us', 'us', 'es', 'us', 'us', 'es'],
         })
-        pd.testing.assert_frame_equal(sampled_data['sessions'], expected_result)
+        assert len(sampled_data['sessions']) == 2
+        result = pd.concat(sampled_data['sessions'], ignore_index=True)
+        pd.testing.assert_frame_equal(result, expected_result)
 
     def test__sample_children(self):
         """Test sampling the children of a table.
@@ -180,31 +215,32 @@ class TestBaseHierarchicalSampler:
         def _add_child_rows(child_name, parent_name, parent_row, sampled_data, num_rows=None):
             if parent_name == 'users':
                 if parent_row['user_id'] == 1:
-                    sampled_data[child_name] = pd.DataFrame({
-                        'user_id': [1, 1],
-                        'session_id': ['a', 'b'],
-                        'os': ['windows', 'linux'],
-                        'country': ['us', 'us'],
-                    })
+                    sampled_data[child_name] = [
+                        pd.DataFrame({
+                            'user_id': [1, 1],
+                            'os': ['windows', 'linux'],
+                            'country': ['us', 'us'],
+                        })
+                    ]
 
                 if parent_row['user_id'] == 3:
                     row = pd.DataFrame({
                         'user_id': [3],
-                        'session_id': ['c'],
                         'os': ['mac'],
                         'country': ['es'],
                     })
-                    sampled_data[child_name] = pd.concat([
-                        sampled_data[child_name],
-                        row,
-                    ]).reset_index(drop=True)
+                    sampled_data[child_name].append(row)
 
         instance = Mock()
         instance.metadata._get_child_map.return_value = {'users': ['sessions', 'transactions']}
         instance.metadata._get_parent_map.return_value = {'users': []}
         instance.metadata._get_foreign_keys.return_value = ['user_id']
         instance._table_sizes = {'users': 10, 'sessions': 5, 'transactions': 3}
-        instance._table_synthesizers = {'users': Mock()}
+        sessions_synthesizer = Mock()
+        sessions_synthesizer._data_processor.add_generated_keys.side_effect = lambda data: (
+            data.assign(session_id=['a', 'b', 'c'])
+        )
+        instance._table_synthesizers = {'users': Mock(), 'sessions': sessions_synthesizer}
         instance._sample_children = sample_children
         instance._add_child_rows.side_effect = _add_child_rows
         instance._null_child_synthesizers = {}
@@ -235,9 +271,9 @@ class TestBaseHierarchicalSampler:
             'users': pd.DataFrame({'user_id': [1, 3]}),
             'sessions': pd.DataFrame({
                 'user_id': [1, 1, 3],
-                'session_id': ['a', 'b', 'c'],
                 'os': ['windows', 'linux', 'mac'],
                 'country': ['us', 'us', 'es'],
+                'session_id': ['a', 'b', 'c'],
             }),
             'transactions': pd.DataFrame({
                 'transaction_id': [1, 2, 3],
@@ -245,6 +281,7 @@ class TestBaseHierarchicalSampler:
             }),
         }
         instance._add_child_rows.assert_has_calls(expected_calls)
+        sessions_synthesizer._data_processor.add_generated_keys.assert_called_once()
         for result_frame, expected_frame in zip(result.values(), expected_result.values()):
             pd.testing.assert_frame_equal(result_frame, expected_frame)
 
@@ -264,14 +301,16 @@ class TestBaseHierarchicalSampler:
 
         def _add_child_rows(child_name, parent_name, parent_row, sampled_data, num_rows=None):
             if num_rows is not None:
-                sampled_data['sessions'] = pd.DataFrame({'user_id': [1], 'session_id': ['a']})
+                sampled_data['sessions'] = [pd.DataFrame({'user_id': [1], 'session_id': ['a']})]
 
         instance = Mock()
         instance.metadata._get_child_map.return_value = {'users': ['sessions', 'transactions']}
         instance.metadata._get_parent_map.return_value = {'users': []}
         instance.metadata._get_foreign_keys.return_value = ['user_id']
         instance._table_sizes = {'users': 10, 'sessions': 5, 'transactions': 3}
-        instance._table_synthesizers = {'users': Mock()}
+        sessions_synthesizer = Mock()
+        sessions_synthesizer._data_processor.add_generated_keys.side_effect = lambda data: data
+        instance._table_synthesizers = {'users': Mock(), 'sessions': sessions_synthesizer}
         instance._sample_children = sample_children
         instance._add_child_rows.side_effect = _add_child_rows
         instance._null_foreign_key_percentages = {'__sessions__user_id': 0}
@@ -470,6 +509,31 @@ class TestBaseHierarchicalSampler:
             "Could not cast back to column's original dtype, keeping original typing."
         )
 
+    def test__finalize_missing_values(self):
+        """Test that finalize keeps the missing values of the columns it casts."""
+        # Setup
+        instance = Mock()
+        sampled_data = {
+            'sessions': pd.DataFrame({
+                'user_id': pd.Series([1.0, np.nan, 2.0], dtype=float),
+                'session_id': pd.Series([0.0, 1.0, 2.0], dtype=float),
+                'extra_column': pd.Series([0.1, 0.2, 0.3], dtype=float),
+            }),
+        }
+        sessions_synth = Mock()
+        sessions_synth._data_processor._dtypes = {'user_id': np.int64, 'session_id': np.int64}
+        instance._table_synthesizers = {'sessions': sessions_synth}
+
+        # Run
+        result = BaseHierarchicalSampler._finalize(instance, sampled_data)
+
+        # Assert
+        expected_result = pd.DataFrame({
+            'user_id': pd.Series([1.0, np.nan, 2.0], dtype=float),
+            'session_id': pd.Series([0, 1, 2], dtype=np.int64),
+        })
+        pd.testing.assert_frame_equal(result['sessions'], expected_result)
+
     def test__sample(self):
         """Test that the whole dataset is sampled.
 
@@ -563,6 +627,28 @@ class TestBaseHierarchicalSampler:
         ])
         instance._finalize.assert_called_once_with(expected_sample)
 
+    def test__sample_clears_child_synthesizers_on_error(self):
+        """Test that the cached child synthesizers are cleared when sampling fails."""
+        # Setup
+        instance = Mock()
+        instance._table_sizes = {'users': 3}
+        instance._table_synthesizers = {'users': Mock()}
+        instance.metadata._get_parent_map.return_value = {'sessions': ['users']}
+        instance.metadata.tables = {'users': Mock(), 'sessions': Mock()}
+
+        def _sample_children_error(table_name, sampled_data, scale):
+            instance._child_synthesizers['sessions'] = Mock()
+            raise ValueError('There are no parent ids left to choose from.')
+
+        instance._sample_children.side_effect = _sample_children_error
+
+        # Run and Assert
+        with pytest.raises(ValueError, match='There are no parent ids left to choose from.'):
+            BaseHierarchicalSampler._sample(instance)
+
+        assert instance._child_synthesizers == {}
+        instance._finalize.assert_not_called()
+
     def test___enforce_table_size_too_many_rows(self):
         """Test it enforces the sampled data to have the same size as the real data.
 
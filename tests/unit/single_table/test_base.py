@@ -950,7 +950,7 @@ class TestBaseSingleTableSynthesizer:
         pd.testing.assert_frame_equal(sampled, data)
         instance._sample.assert_called_once_with(3)
         instance._data_processor.reverse_transform.assert_called_once_with(
-            instance._sample.return_value
+            instance._sample.return_value, skip_keys=False
         )
         instance._data_processor.filter_valid.assert_called_once_with(
             instance._data_processor.reverse_transform.return_value
@@ -979,7 +979,7 @@ class TestBaseSingleTableSynthesizer:
         pd.testing.assert_frame_equal(sampled, data[data.name == 'John Doe'])
         instance._sample.assert_called_once_with(3, {'salary': 80.0})
         instance._data_processor.reverse_transform.assert_called_once_with(
-            instance._sample.return_value
+            instance._sample.return_value, skip_keys=False
         )
         instance._data_processor.filter_valid.assert_called_once_with(
             instance._data_processor.reverse_transform.return_value
@@ -1014,7 +1014,7 @@ class TestBaseSingleTableSynthesizer:
         pd.testing.assert_frame_equal(sampled, expected_data)
         instance._sample.assert_called_once_with(3)
         instance._data_processor.reverse_transform.assert_called_once_with(
-            instance._sample.return_value
+            instance._sample.return_value, skip_keys=False
         )
 
     def test__sample_rows_notimplementederror(self):
@@ -1048,7 +1048,7 @@ class TestBaseSingleTableSynthesizer:
         # Setup
         instance = Mock()
         instance._data_processor.get_sdtypes.return_value = {}
-        instance._data_processor.reverse_transform.side_effect = lambda x: x
+        instance._data_processor.reverse_transform.side_effect = lambda x, skip_keys: x
 
         # Run
         sampled, num_rows = BaseSingleTableSynthesizer._sample_rows(instance, 10)